@@ -5,4 +5,10 @@ if TYPE_CHECKING:
 
 class RedBase:
     """Baseclass for all Rocketry classes"""
+    __slots__ = ()
     session: 'Session' = None
+
+def _get_slots(cls):
+    "Get the names of the slots of a class and its bases"
+    for base in cls.__mro__:
+        yield from base.__dict__.get("__slots__", ())
@@ -1 +1 @@
-from .base import AlwaysTrue, AlwaysFalse, All, Any, Not, BaseCondition, BaseComparable
+from .base import AlwaysTrue, AlwaysFalse, All, Any, Not, BaseCondition, BaseComparable, memoize_cycle
@@ -1,9 +1,16 @@
+import itertools
+import linecache
+import math
+import threading
+import time
+from contextlib import contextmanager
 from copy import copy
+from functools import lru_cache, wraps
 from abc import abstractmethod
-from typing import Callable, Dict, Pattern, Union
+from typing import Callable, Dict, Iterable, Optional, Pattern, Union
 
-from rocketry._base import RedBase
-from rocketry.core.parameters.parameters import Parameters
+from rocketry._base import RedBase, _get_slots
+from rocketry.core.parameters.parameters import Parameters, _get_signature_args, get_kwargs
 
 PARSERS: Dict[Union[str, Pattern], Union[Callable, 'BaseCondition']] = {}
 
@@ -26,6 +33,10 @@ class BaseCondition(RedBase):
     as minimum. This method should return ``True`` or ``False``
     depending on whether the condition holds or does not hold.
 
+    Conditions whose state cannot change during a scheduler
+    cycle can set ``__pure__ = True`` to be observed only once
+    per cycle (for the same arguments).
+
     Examples
     --------
 
@@ -60,11 +71,45 @@ class BaseCondition(RedBase):
 
     """
 
+    __slots__ = ("_str",)
+    __pure__ = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "__parsers__" in cls.__dict__:
+            # Only the classes that define parsers are registered
+            cls._add_parsers()
+        observe = cls.observe
+        if getattr(observe, "_memoized", False):
+            observe = observe.__wrapped__
+        if getattr(observe, "_from_get_state", False):
+            # Not overridden thus can be specialized
+            observe = _get_observe(cls.get_state)
+        if cls.__pure__:
+            observe = _memoize_in_cycle(observe)
+        if observe is not cls.observe:
+            cls.observe = observe
+
+    @classmethod
+    def _add_parsers(cls):
+        "Add the parsers in __parsers__ to the condition parsers"
+        from rocketry.session import Session
+        parsers = {
+            statement: cls if method == "__init__" else getattr(cls, method)
+            for statement, method in cls.__parsers__.items()
+        }
+        Session._cls_cond_parsers.update(parsers)
+        if cls.session is not None:
+            # Session already created thus it has
+            # its own copy of the parsers
+            cls.session._cond_parsers.update(parsers)
+
     def observe(self, **kwargs):
         "Observe the status of the condition"
         cond_params = Parameters._from_signature(self.get_state, **kwargs)
         param_dict = cond_params.materialize(**kwargs)
         return self.get_state(**param_dict)
+    observe._from_get_state = True
 
     def __bool__(self) -> bool:
         """Check whether the condition holds."""
@@ -97,31 +142,167 @@ class BaseCondition(RedBase):
 
     def __eq__(self, other):
         "Equal operation"
-        is_same_class = isinstance(other, type(self))
+        is_same_class = type(other) is type(self)
         if is_same_class:
-            # Check equality of the attributes except
-            # those that are only for display purposes
-            repr_attrs = ("_str",)
-            self_dict = {
-                key: val for key, val in self.__dict__.items()
-                if key not in repr_attrs
-            }
-            other_dict = {
-                key: val for key, val in other.__dict__.items()
-                if key not in repr_attrs
-            }
-            return self_dict == other_dict
+            return self._get_attrs() == other._get_attrs()
         return False
 
+    def _get_attrs(self) -> dict:
+        "Get the attributes that define the condition"
+        attrs = dict(getattr(self, "__dict__", {}))
+        for name in _get_slots(type(self)):
+            # The string is only for display purposes
+            if name not in ("_str", "__dict__", "__weakref__") and hasattr(self, name):
+                attrs[name] = getattr(self, name)
+        return attrs
+
+    def __hash__(self):
+        # Equal conditions are of the same type
+        return hash(type(self))
+
     def __str__(self):
-        if hasattr(self, "_str"):
-            return self._str
+        string = getattr(self, "_str", None)
+        if string is None:
+            return self._default_str()
+        return string
+
+    def _default_str(self) -> str:
+        "Get string representation if not set (by the parser)"
         raise AttributeError(f"Condition {type(self)} is missing __str__.")
 
 
-class _ConditionContainer:
+_cycle = threading.local()
+
+@contextmanager
+def memoize_cycle():
+    """Observe the pure conditions only once
+    (per arguments) inside the block"""
+    if getattr(_cycle, "cache", None) is not None:
+        # Already in a cycle
+        yield
+        return
+    _cycle.cache = {}
+    try:
+        yield
+    finally:
+        _cycle.cache = None
+
+def _memoize_in_cycle(observe:Callable) -> Callable:
+    @wraps(observe)
+    def wrapper(self, **kwargs):
+        cache = getattr(_cycle, "cache", None)
+        if cache is None:
+            return observe(self, **kwargs)
+        key = (id(self), *kwargs.items())
+        try:
+            return cache[key][1]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments
+            return observe(self, **kwargs)
+        state = observe(self, **kwargs)
+        # The condition is kept alive in the cache thus
+        # its id is not reused during the cycle
+        cache[key] = (self, state)
+        return state
+    wrapper._memoized = True
+    return wrapper
+
+def _get_observe(get_state:Callable) -> Callable:
+    "Get observe method specialized to the arguments of get_state"
+    args = tuple(
+        # The arguments of get_value that have no arguments
+        # in their own signature get the passed arguments as is
+        (name, arg, not Parameters._from_signature(arg.get_value))
+        for name, arg in _get_signature_args.__wrapped__(get_state)
+    )
+    if args:
+        def observe(self, **kwargs):
+            "Observe the status of the condition"
+            return self.get_state(**{
+                name: arg.get_value(**kwargs)
+                      if is_passthrough
+                      else arg.get_value(**get_kwargs(arg.get_value, **kwargs))
+                for name, arg, is_passthrough in args
+            })
+    else:
+        def observe(self, **kwargs):
+            "Observe the status of the condition"
+            return self.get_state()
+    observe._from_get_state = True
+    return observe
+
+_compiled_names = itertools.count()
+
+@lru_cache(maxsize=256)
+def _compile_code(expr:str):
+    "Compile the function observing the expression (cached per shape of the tree)"
+    source = (
+        "def observe(**kwargs):\n"
+        f"    if kwargs:\n        return bool({expr})\n"
+        f"    return bool({expr.replace('(**kwargs)', '()')})\n"
+    )
+    # Named and put to the line cache so that the
+    # tracebacks show the compiled expression
+    filename = f"<rocketry condition {next(_compiled_names)}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    return compile(source, filename, "exec")
+
+def _compile_observe(cond:'_ConditionContainer', conditions:Iterable['BaseCondition']) -> Optional[Callable]:
+    """Compile the condition tree to one function
+
+    Nested All, Any and Not are turned to one boolean
+    expression of the observe methods of the rest of
+    the conditions (observing the given conditions of
+    the root in the given order) thus the containers
+    need no calls when observed. Returns None if the
+    tree is too deep for an expression.
+
+    The expression is executed as source code as Python
+    has no other way to build a function without a
+    frame per container (closures are slower than the
+    containers themselves)."""
+    observes = {}
+
+    def get_expr(cond):
+        cls = type(cond)
+        if cls is All or cls is Any:
+            return get_oper_expr(cls, cond.subconditions)
+        if cls is Not:
+            return f'(not {get_expr(cond.condition)})'
+        name = f'_observe{len(observes)}'
+        observes[name] = cond.observe
+        return f'{name}(**kwargs)'
+
+    def get_oper_expr(cls, conditions):
+        oper = ' and ' if cls is All else ' or '
+        return '(' + oper.join(map(get_expr, conditions)) + ')'
+
+    try:
+        # The root may be a subclass of All or Any
+        expr = get_oper_expr(All if isinstance(cond, All) else Any, conditions)
+        exec(_compile_code(expr), observes)
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+    return observes['observe']
+
+
+class _ConditionContainer(BaseCondition):
     "Wraps another condition"
 
+    __slots__ = ("subconditions", "_observe_fns", "_n_observations", "_stats", "_compiled")
+
+    # Observations measured before reordering the
+    # subconditions (if config.reorder_conditions)
+    n_reorder_observations = 32
+
+    def __init__(self, subconditions):
+        self._n_observations = 0
+        self._stats = None
+        self._set_subconditions(subconditions)
+        self._compile()
+
     def __getitem__(self, val):
         return self.subconditions[val]
 
@@ -130,88 +311,255 @@ class _ConditionContainer:
 
     def __eq__(self, other):
         "Equal operation"
-        is_same_class = isinstance(other, type(self))
+        is_same_class = type(other) is type(self)
         if is_same_class:
             return self.subconditions == other.subconditions
         return False
 
+    def __hash__(self):
+        return hash((type(self), self.subconditions))
+
     def __repr__(self):
         string = ', '.join(map(str, self.subconditions))
         return f'{type(self).__name__}({string})'
 
-class Any(_ConditionContainer, BaseCondition):
-
-    def __init__(self, *conditions):
-        self.subconditions = []
+    def _set_subconditions(self, subconditions):
+        self.subconditions = tuple(subconditions)
+        # Bound beforehand as observing is the hot path
+        self._observe_fns = tuple(cond.observe for cond in self.subconditions)
+
+    def _is_measuring(self) -> bool:
+        "Whether to measure the subconditions (if not yet measured enough)"
+        session = self.session
+        if session is None or not session.config.reorder_conditions:
+            # Not measured thus no need to check again
+            # and the order is final
+            self._n_observations = self.n_reorder_observations
+            return False
+        return True
 
+    def _compile(self):
+        "Compile the observing of nested subconditions (in the observing order)"
+        self._compiled = None
+        if not isinstance(self, (All, Any)):
+            return
+        if any(type(cond) in (All, Any, Not) for cond in self.subconditions):
+            # Nested thus worth compiling
+            conditions = {cond.observe: cond for cond in self.subconditions}
+            ordered = [conditions[observe] for observe in self._observe_fns]
+            self._compiled = _compile_observe(self, ordered)
+
+    def _observe_measured(self, kwargs:dict, decisive:bool) -> bool:
+        "Observe the subconditions measuring their costs and outcomes"
+        stats = self._stats
+        if stats is None:
+            stats = self._stats = [[0, 0, 0] for _ in self.subconditions]
+        self._n_observations += 1
+
+        outcome = not decisive
+        for subcond, stat in zip(self.subconditions, stats):
+            start = time.perf_counter_ns()
+            state = bool(subcond.observe(**kwargs))
+            stat[0] += 1
+            stat[1] += time.perf_counter_ns() - start
+            if state is decisive:
+                stat[2] += 1
+                outcome = decisive
+                break
+
+        if self._n_observations >= self.n_reorder_observations:
+            self._reorder()
+        return outcome
+
+    def _reorder(self):
+        "Observe first the subconditions that are cheap and likely to decide the outcome"
+        def get_expected_cost(item):
+            (n_observed, cost, n_decided), _ = item
+            if not n_observed:
+                # Never reached, keeping the order
+                return math.inf
+            # Cost per decided outcome (the probability is smoothed)
+            return (cost / n_observed) * (n_observed + 2) / (n_decided + 1)
+
+        # Only the observing order is changed as the subconditions
+        # define the condition (equality, hash and representation)
+        ordered = sorted(zip(self._stats, self._observe_fns), key=get_expected_cost)
+        self._observe_fns = tuple(observe for _, observe in ordered)
+        self._stats = None
+        self._compile()
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for name in _get_slots(type(self)):
+            # The compiled function cannot be pickled
+            if name != "_compiled" and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._compile()
+
+    def _simplify(self, conditions, dominant:type, neutral:type, dual:type) -> list:
+        """Simplify the subconditions
+
+        Dominant is the constant that decides the outcome
+        (true for Any), neutral is the constant that does
+        not affect it (false for Any) and dual is the
+        opposite container (All for Any)."""
+        # Avoiding nesting (like Any(Any(...), ...) --> Any(...))
+        subconditions = list(self._iter_flattened(conditions))
+
+        # Removing the negations of the siblings from the
+        # dual containers (a | (~a & b) --> a | b)
+        is_changed = False
+        for i, cond in enumerate(subconditions):
+            if type(cond) is not dual:
+                continue
+            siblings = subconditions[:i] + subconditions[i+1:]
+            remaining = [
+                subcond for subcond in cond.subconditions
+                if not (type(subcond) is Not and subcond.condition in siblings)
+            ]
+            if len(remaining) == len(cond.subconditions):
+                continue
+            if not remaining:
+                # Like a | ~a --> true
+                subconditions[i] = dominant()
+            elif len(remaining) == 1:
+                subconditions[i] = remaining[0]
+            else:
+                subconditions[i] = dual(*remaining)
+            is_changed = True
+        if is_changed:
+            subconditions = list(self._iter_flattened(subconditions))
+
+        # Simplifying constants (true | ... --> true, false | ... --> ...)
+        for cond in subconditions:
+            if isinstance(cond, dominant):
+                return [cond]
+        subconditions = [
+            cond for cond in subconditions
+            if not isinstance(cond, neutral)
+        ] or subconditions[:1]
+
+        # Removing duplicates (a | a --> a)
+        try:
+            return list(dict.fromkeys(subconditions))
+        except TypeError:
+            # Unhashable conditions
+            unique = []
+            for cond in subconditions:
+                if cond not in unique:
+                    unique.append(cond)
+            return unique
+
+    def _iter_flattened(self, conditions):
+        "Iterate the conditions splicing in the (nested) subconditions of the same type"
         self_type = type(self)
         for cond in conditions:
-            # Avoiding nesting (like Any(Any(...), ...) --> Any(...))
-            conds = cond.subconditions if isinstance(cond, self_type) else [cond]
-            self.subconditions += conds
+            if isinstance(cond, self_type):
+                yield from self._iter_flattened(cond.subconditions)
+            else:
+                yield cond
+
+class Any(_ConditionContainer, BaseCondition):
+
+    __slots__ = ()
+
+    def __init__(self, *conditions):
+        # Simplifying (like a | (~a & b) | false | a --> a | b)
+        subconditions = self._simplify(conditions, dominant=AlwaysTrue, neutral=AlwaysFalse, dual=All)
+        super().__init__(subconditions)
 
     def observe(self, **kwargs) -> bool:
-        for subcond in self.subconditions:
-            if subcond.observe(**kwargs):
+        if self._n_observations < self.n_reorder_observations and self._is_measuring():
+            return self._observe_measured(kwargs, decisive=True)
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled(**kwargs)
+        if not kwargs:
+            # Common case, not passing the (empty) arguments on
+            for observe in self._observe_fns:
+                if observe():
+                    return True
+            return False
+        for observe in self._observe_fns:
+            if observe(**kwargs):
                 return True
         return False
 
-    def __str__(self):
-        try:
-            return super().__str__()
-        except AttributeError:
-            string = ' | '.join(map(str, self.subconditions))
-            return f'({string})'
+    def _default_str(self) -> str:
+        string = ' | '.join(map(str, self.subconditions))
+        return f'({string})'
 
 
 class All(_ConditionContainer, BaseCondition):
 
-    def __init__(self, *conditions):
-        self.subconditions = []
+    __slots__ = ()
 
-        self_type = type(self)
-        for cond in conditions:
-            # Avoiding nesting (like All(All(...), ...) --> All(...))
-            conds = cond.subconditions if isinstance(cond, self_type) else [cond]
-            self.subconditions += conds
+    def __init__(self, *conditions):
+        # Simplifying (like a & (~a | b) & true & a --> a & b)
+        subconditions = self._simplify(conditions, dominant=AlwaysFalse, neutral=AlwaysTrue, dual=Any)
+        super().__init__(subconditions)
 
     def observe(self, **kwargs) -> bool:
-        for subcond in self.subconditions:
-            if not subcond.observe(**kwargs):
+        if self._n_observations < self.n_reorder_observations and self._is_measuring():
+            return self._observe_measured(kwargs, decisive=False)
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled(**kwargs)
+        if not kwargs:
+            # Common case, not passing the (empty) arguments on
+            for observe in self._observe_fns:
+                if not observe():
+                    return False
+            return True
+        for observe in self._observe_fns:
+            if not observe(**kwargs):
                 return False
         return True
 
-    def __str__(self):
-        try:
-            return super().__str__()
-        except AttributeError:
-            string = ' & '.join(map(str, self.subconditions))
-            return f'({string})'
+    def _default_str(self) -> str:
+        string = ' & '.join(map(str, self.subconditions))
+        return f'({string})'
 
 
 class Not(_ConditionContainer, BaseCondition):
 
+    __slots__ = ("condition", "_observe_fn")
+
+    def __new__(cls, condition=None):
+        # Simplifying (~true --> false, ~false --> true, ~~a --> a)
+        if cls is Not:
+            if type(condition) in (All, Any) and len(condition.subconditions) == 1:
+                # ~All(a) --> ~a (which may simplify further)
+                condition = condition.subconditions[0]
+            if isinstance(condition, AlwaysTrue):
+                return AlwaysFalse()
+            if isinstance(condition, AlwaysFalse):
+                return AlwaysTrue()
+            if type(condition) is Not and not isinstance(condition.condition, Not):
+                return condition.condition
+        return super().__new__(cls)
+
     def __init__(self, condition):
         # TODO: rename condition as child
         self.condition = condition
+        super().__init__((condition,))
+        self._observe_fn = condition.observe
 
     def observe(self, **kwargs):
-        return not self.condition.observe(**kwargs)
+        return not self._observe_fn(**kwargs)
 
     def __repr__(self):
         string = repr(self.condition)
         return f'Not({string})'
 
-    def __str__(self):
-        try:
-            return super().__str__()
-        except AttributeError:
-            string = str(self.condition)
-            return f'~{string}'
-
-    @property
-    def subconditions(self):
-        return (self.condition,)
+    def _default_str(self) -> str:
+        string = str(self.condition)
+        return f'~{string}'
 
     def __invert__(self):
         "inverse of inverse is the actual condition"
@@ -224,14 +572,20 @@ class Not(_ConditionContainer, BaseCondition):
         if isinstance(other, AlwaysFalse):
             return isinstance(self.condition, AlwaysTrue)
 
-        is_same_class = isinstance(other, type(self))
+        is_same_class = type(other) is type(self)
         if is_same_class:
             return self.condition == other.condition
         return False
 
+    def __hash__(self):
+        return hash((type(self), self.condition))
+
 
 class AlwaysTrue(BaseCondition):
     "Condition that is always true"
+
+    __slots__ = ()
+
     def observe(self, **kwargs):
         return True
 
@@ -244,6 +598,8 @@ class AlwaysTrue(BaseCondition):
 class AlwaysFalse(BaseCondition):
     "Condition that is always false"
 
+    __slots__ = ()
+
     def observe(self, **kwargs):
         return False
 
@@ -282,10 +638,11 @@ class BaseComparable(BaseCondition):
 
         if not compares:
             return res > 0
-        return all(
-            getattr(res, comp)(val) # Comparison is magic method (==, !=, etc.)
-            for comp, val in compares.items()
-        )
+        for comp, val in compares.items():
+            # Comparison is magic method (==, !=, etc.)
+            if not getattr(res, comp)(val):
+                return False
+        return True
 
     def _is_any_over_zero(self):
         # Useful for optimization: just find any observation and the statement is true
@@ -315,6 +672,8 @@ class BaseComparable(BaseCondition):
             return super().__eq__(other)
         return self._set_comparison("__eq__", other)
 
+    __hash__ = BaseCondition.__hash__
+
     def __ne__(self, other):
         # self != other
         return self._set_comparison("__ne__", other)
@@ -1,6 +1,6 @@
 from collections.abc import Mapping
 from typing import Callable, Type, Union, TYPE_CHECKING
-from functools import partial
+from functools import lru_cache, partial
 import inspect
 
 from rocketry._base import RedBase
@@ -52,13 +52,16 @@ class Parameters(RedBase, Mapping): # Mapping so that mytask(**Parameters(...))
         # Get parameters from a function signature
         # ie.
         # def myfunc(task=Task(), session=Session()): ...
-        func_params = inspect.signature(__func).parameters
-        params = cls()
-        for name, param in func_params.items():
-            default = param.default
-            if isinstance(default, BaseArgument):
-                params[name] = default
-        return params
+
+        # The signature is the same for all the bound
+        # methods of a function thus cached by the function
+        func = getattr(__func, "__func__", __func)
+        try:
+            args = _get_signature_args(func)
+        except TypeError:
+            # Not hashable
+            args = _get_signature_args.__wrapped__(func)
+        return cls(dict(args))
 
 # For mapping interface
     def get(self, key, default=None):
@@ -210,7 +213,18 @@ class Parameters(RedBase, Mapping): # Mapping so that mytask(**Parameters(...))
             for key, val in self._params.items()
         }
 
+@lru_cache(maxsize=1024)
+def _get_signature_args(func:Callable) -> tuple:
+    "Get the arguments set as defaults in the signature of a function"
+    return tuple(
+        (name, param.default)
+        for name, param in inspect.signature(func).parameters.items()
+        if isinstance(param.default, BaseArgument)
+    )
+
 def get_kwargs(__func, **kwargs) -> dict:
     "Get function arguments"
     sig_kwargs = Parameters._from_signature(__func).materialize(**kwargs)
+    if not sig_kwargs:
+        return kwargs
     return {**sig_kwargs, **kwargs}
\ No newline at end of file
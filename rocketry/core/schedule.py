@@ -12,7 +12,7 @@ import platform
 from queue import Empty
 
 from rocketry._base import RedBase
-from rocketry.core.condition import BaseCondition, AlwaysFalse
+from rocketry.core.condition import BaseCondition, AlwaysFalse, memoize_cycle
 from rocketry.core.task import Task
 from rocketry.exc import SchedulerRestart, SchedulerExit, TaskLoggingError, TaskSetupError
 from rocketry.core.hook import _Hooker
@@ -170,19 +170,20 @@ class Scheduler(RedBase):
         hooker = _Hooker(self.session.hooks.scheduler_cycle)
         hooker.prerun(scheduler=self)
 
-        for task in tasks:
-            with task.lock:
-                self.handle_logs()
-                task._clean_run_stack()
-                if task.on_startup or task.on_shutdown:
-                    # Startup or shutdown tasks are not run in main sequence
-                    pass
-                elif self._flag_enabled.is_set() and self.is_task_runnable(task):
-                    # Run the actual task
-                    await self.run_task(task)
-                    # Reset force_run as a run has forced
-                    task.force_run = False
-                await task._check_termination()
+        with memoize_cycle():
+            for task in tasks:
+                with task.lock:
+                    self.handle_logs()
+                    task._clean_run_stack()
+                    if task.on_startup or task.on_shutdown:
+                        # Startup or shutdown tasks are not run in main sequence
+                        pass
+                    elif self._flag_enabled.is_set() and self.is_task_runnable(task):
+                        # Run the actual task
+                        await self.run_task(task)
+                        # Reset force_run as a run has forced
+                        task.force_run = False
+                    await task._check_termination()
         self.handle_logs()
         self.check_thread_errors()
         # Running hooks
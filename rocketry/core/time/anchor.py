@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import ClassVar, Dict, List, Tuple, Union
 from abc import abstractmethod
 from dataclasses import dataclass
@@ -6,6 +6,17 @@ from dataclasses import dataclass
 from rocketry.pybox.time import to_microseconds, timedelta_to_str, datetime_to_dict, to_timedelta
 from .base import Any, TimeInterval
 
+_SCOPE_MICROSECONDS = {
+    "second": to_microseconds(second=1),
+    "minute": to_microseconds(minute=1),
+    "hour": to_microseconds(hour=1),
+    "day": to_microseconds(day=1),
+}
+
+def _day_microseconds(dt) -> int:
+    "Microseconds from the start of the day of the datetime"
+    return ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1_000_000 + dt.microsecond
+
 @dataclass(frozen=True, repr=False)
 class AnchoredInterval(TimeInterval):
     """Base class for interval for those that have
@@ -37,6 +48,8 @@ class AnchoredInterval(TimeInterval):
     -----------------
         _scope [str] :
     """
+    __slots__ = ("_start", "_end", "_start_orig", "_end_orig")
+
     _start: int
     _end: int
 
@@ -45,6 +58,9 @@ class AnchoredInterval(TimeInterval):
     # Components that have always fixed length (exactly the same amount of time)
     _fixed_components: ClassVar[Tuple[str]] = ("week", "day", "hour", "minute", "second", "microsecond")
 
+    # The rolls depend only on the start and the end
+    cache_rolls: ClassVar[bool] = True
+
     _scope: ClassVar[str] = None # Scope of the full period. Ie. day, hour, second, microsecond
     _scope_max: ClassVar[int] = None # Max in microseconds of the
 
@@ -96,6 +112,10 @@ class AnchoredInterval(TimeInterval):
 
     def anchor_dt(self, dt: datetime, **kwargs) -> int:
         "Turn datetime to nanoseconds according to the scope (by removing higher time elements)"
+        scope_max = _SCOPE_MICROSECONDS.get(self._scope)
+        if scope_max is not None:
+            # Scope within a day: the time of the day wrapped to the scope
+            return _day_microseconds(dt) % scope_max
         components = self.components
         components = components[components.index(self._scope) + 1:]
         d = datetime_to_dict(dt)
@@ -127,6 +147,7 @@ class AnchoredInterval(TimeInterval):
             ms = self.anchor(val, side="start")
         self._validate(ms, orig=val)
         object.__setattr__(self, "_start", ms)
+        object.__setattr__(self, "_rolls", None)
         object.__setattr__(self, "_start_orig", val)
 
     def set_end(self, val, right_closed=False, time_point=False, starting=False):
@@ -147,6 +168,7 @@ class AnchoredInterval(TimeInterval):
             ms += 1
         self._validate(ms, orig=val)
         object.__setattr__(self, "_end", ms)
+        object.__setattr__(self, "_rolls", None)
         object.__setattr__(self, "_end_orig", val)
 
     def to_timepoint(self, ms:int):
@@ -254,7 +276,7 @@ class AnchoredInterval(TimeInterval):
             #            dt
             #  -->----------<----------->--------------<-
             #  start   |   end        start     |     end
-            offset = to_timedelta(int(ms_start) - int(ms), unit="microsecond")
+            offset = timedelta(microseconds=int(ms_start) - int(ms))
         else:
             # not in period, later than start
             #      dt
@@ -271,7 +293,7 @@ class AnchoredInterval(TimeInterval):
             # --<---------->-----------<-------------->--
             #  end   |   start        end    |      start
             ms_scope = self.get_scope_forward(dt)
-            offset = to_timedelta(int(ms_start) - int(ms) + ms_scope, unit="microsecond")
+            offset = timedelta(microseconds=int(ms_start) - int(ms) + ms_scope)
         return dt + offset
 
     def next_end(self, dt):
@@ -295,7 +317,7 @@ class AnchoredInterval(TimeInterval):
             #          dt
             # --<---------->-----------<-------------->--
             #  end   |   start        end    |      start
-            offset = to_timedelta(int(ms_end) - int(ms), unit="microsecond")
+            offset = timedelta(microseconds=int(ms_end) - int(ms))
         else:
             # not in period, over night
             #                     dt
@@ -312,7 +334,7 @@ class AnchoredInterval(TimeInterval):
             #  -->----------<----------->--------------<-
             #  start   |   end        start     |     end
             ms_scope = self.get_scope_forward(dt)
-            offset = to_timedelta(int(ms_end) - int(ms) + ms_scope, unit="microsecond")
+            offset = timedelta(microseconds=int(ms_end) - int(ms) + ms_scope)
         return dt + offset
 
     def prev_start(self, dt):
@@ -336,7 +358,7 @@ class AnchoredInterval(TimeInterval):
             #  -->----------<----------->--------------<-
             #  start   |   end        start     |     end
             ms_scope = self.get_scope_back(dt)
-            offset = to_timedelta(int(ms_start) - int(ms) - ms_scope, unit="microsecond")
+            offset = timedelta(microseconds=int(ms_start) - int(ms) - ms_scope)
         else:
             # not in period, later than start
             #      dt
@@ -352,7 +374,7 @@ class AnchoredInterval(TimeInterval):
             #                    dt
             # --<---------->-----------<-------------->--
             #  end   |   start        end    |      start
-            offset = to_timedelta(int(ms_start) - int(ms), unit="microsecond")
+            offset = timedelta(microseconds=int(ms_start) - int(ms))
         return dt + offset
 
     def prev_end(self, dt):
@@ -376,7 +398,7 @@ class AnchoredInterval(TimeInterval):
             # --<---------->-----------<-------------->--
             #  end   |   start        end    |      start
             ms_scope = self.get_scope_back(dt)
-            offset = to_timedelta(int(ms_end) - int(ms) - ms_scope, unit="microsecond")
+            offset = timedelta(microseconds=int(ms_end) - int(ms) - ms_scope)
         else:
             # not in period, over night
             #                     dt
@@ -392,7 +414,7 @@ class AnchoredInterval(TimeInterval):
             #       dt
             #  -->----------<----------->--------------<-
             #  start   |   end        start     |     end
-            offset = to_timedelta(int(ms_end) - int(ms), unit="microsecond")
+            offset = timedelta(microseconds=int(ms_end) - int(ms))
 
         return dt + offset
 
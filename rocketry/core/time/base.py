@@ -1,16 +1,60 @@
 import datetime
-from functools import reduce
+from functools import wraps
+import threading
 import time
 from abc import abstractmethod
 from typing import Callable, ClassVar, Dict, FrozenSet, List, Optional, Pattern, Union
 import itertools
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
-from rocketry._base import RedBase
+from rocketry._base import RedBase, _get_slots
 from rocketry.pybox.time import to_datetime, to_timedelta, Interval
 
 PARSERS: Dict[Union[str, Pattern], Union[Callable, 'TimePeriod']] = {}
 
+ROLL_CACHE_SIZE = 128
+
+# Looked up in the rolling loops thus as a global
+RESOLUTION = datetime.timedelta.resolution
+
+# Guards the eviction as the periods may be rolled
+# from several threads (ie. conditions of thread tasks)
+_roll_cache_lock = threading.Lock()
+
+def cache_roll(func):
+    """Cache the intervals a period rolls to
+
+    Only periods that set ``cache_rolls`` are cached
+    as the intervals must depend only on the (immutable)
+    period and the datetime. The cache hits when the same
+    period is rolled with the same datetime (ie. periods
+    shared by conditions in a scheduler cycle)."""
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self, dt):
+        if not self.cache_rolls:
+            return func(self, dt)
+        cache = getattr(self, "_rolls", None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, "_rolls", cache)
+        # Equal datetimes can still have different
+        # timezones or types thus these are in the key
+        key = (name, type(dt), getattr(dt, "tzinfo", None), dt)
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        interval = func(self, dt)
+        with _roll_cache_lock:
+            if len(cache) >= ROLL_CACHE_SIZE:
+                # Drop the oldest
+                del cache[next(iter(cache))]
+            cache[key] = interval
+        return interval
+    return wrapper
+
 @dataclass(frozen=True)
 class TimePeriod(RedBase):
     """Base for all classes that represent a time period.
@@ -20,11 +64,18 @@ class TimePeriod(RedBase):
     place in a specific time span or whether current time
     is in a given time span.
     """
+    # Periods are created per condition thus the
+    # subclasses also define slots (no instance dict)
+    __slots__ = ("_rolls",)
 
-    resolution: ClassVar[datetime.timedelta] = datetime.timedelta.resolution
+    resolution: ClassVar[datetime.timedelta] = RESOLUTION
     min: ClassVar[datetime.datetime] = datetime.datetime(1970, 1, 3, 2, 0)
     max: ClassVar[datetime.datetime] = datetime.datetime(2260, 1, 1, 0, 0)
 
+    # Whether the rolled intervals are cached (opt-in
+    # as the rolls may depend on other than the period)
+    cache_rolls: ClassVar[bool] = False
+
     def __contains__(self, other):
         """Whether a given point of time is in
         the TimePeriod"""
@@ -69,6 +120,23 @@ class TimePeriod(RedBase):
         "Get previous time interval of the period."
         raise NotImplementedError
 
+    def __getstate__(self):
+        # The default state of slots is restored with
+        # setattr which does not work with frozen classes
+        state = dict(getattr(self, "__dict__", {}))
+        for name in _get_slots(type(self)):
+            if name != "_rolls" and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+def _as_datetime(dt):
+    # The rolled ends are nearly always datetimes already
+    return dt if isinstance(dt, datetime.datetime) else to_datetime(dt)
+
 class TimeInterval(TimePeriod):
     """Base for all time intervals
 
@@ -81,6 +149,7 @@ class TimeInterval(TimePeriod):
 
     Answers to "between 11:00 and 12:00" and "from monday to tuesday"
     """
+    __slots__ = ()
     _type_name: ClassVar = "interval"
     @abstractmethod
     def __contains__(self, dt):
@@ -125,6 +194,7 @@ class TimeInterval(TimePeriod):
         "Whether every time belongs to the period (but there is still distinct intervals)"
         return False
 
+    @cache_roll
     def rollforward(self, dt) -> datetime.datetime:
         "Get next time interval of the period"
 
@@ -135,7 +205,7 @@ class TimeInterval(TimePeriod):
             end = self.next_end(dt)
             if end == start:
                 # Expanding the interval
-                end = self.next_end(dt + self.resolution)
+                end = self.next_end(dt + RESOLUTION)
         else:
             start = self.rollstart(dt)
             end = self.next_end(dt)
@@ -143,13 +213,14 @@ class TimeInterval(TimePeriod):
                 # The interval is left closed so this should
                 # not contain any points. We look for another
                 # one
-                return self.rollforward(end + self.resolution)
+                return self.rollforward(end + RESOLUTION)
 
-        start = to_datetime(start)
-        end = to_datetime(end)
+        start = _as_datetime(start)
+        end = _as_datetime(end)
 
         return Interval(start, end, closed=closed)
 
+    @cache_roll
     def rollback(self, dt) -> Interval:
         "Get previous time interval of the period"
 
@@ -160,7 +231,7 @@ class TimeInterval(TimePeriod):
             start = self.prev_start(dt)
             if end == start:
                 # Expanding the interval
-                start = self.prev_start(dt - self.resolution)
+                start = self.prev_start(dt - RESOLUTION)
         else:
             end = self.rollend(dt)
             start = self.prev_start(dt)
@@ -170,18 +241,21 @@ class TimeInterval(TimePeriod):
                 # we include a single point (both sides closed)
                 closed = "both"
 
-        start = to_datetime(start)
-        end = to_datetime(end)
+        start = _as_datetime(start)
+        end = _as_datetime(end)
 
         return Interval(start, end, closed=closed)
 
     def __eq__(self, other):
         "Test whether self and other are essentially the same periods"
-        is_same_class = isinstance(self, type(other))
+        is_same_class = type(self) is type(other)
         if is_same_class:
             return (self._start == other._start) and (self._end == other._end)
         return False
 
+    def __hash__(self):
+        return hash((self._start, self._end))
+
 @dataclass(frozen=True)
 class TimeDelta(TimePeriod):
     """Base for all time deltas
@@ -192,9 +266,10 @@ class TimeDelta(TimePeriod):
     the reference point is set. This reference
     point is typically current datetime.
     """
+    __slots__ = ("past", "future", "reference")
     _type_name: ClassVar = "delta"
 
-    reference: Optional[datetime.datetime] = field(default=None)
+    reference: Optional[datetime.datetime]
 
     def __init__(self, past=None, future=None, reference=None, *, kws_past=None, kws_future=None):
 
@@ -204,6 +279,7 @@ class TimeDelta(TimePeriod):
         kws_past = {} if kws_past is None else kws_past
         kws_future = {} if kws_future is None else kws_future
 
+        # Stored non-negative (the rolls rely on it)
         object.__setattr__(self, "past", abs(to_timedelta(past, **kws_past)))
         object.__setattr__(self, "future", abs(to_timedelta(future, **kws_future)))
         object.__setattr__(self, "reference", reference)
@@ -215,8 +291,8 @@ class TimeDelta(TimePeriod):
     def __contains__(self, dt):
         "Check whether the datetime is in "
         reference = self.get_reference()
-        start = reference - abs(self.past)
-        end = reference + abs(self.future)
+        start = reference - self.past
+        end = reference + self.future
         return start <= dt <= end
 
     def get_reference(self) -> datetime.datetime:
@@ -224,25 +300,27 @@ class TimeDelta(TimePeriod):
 
     def rollback(self, dt):
         "Get previous interval (including currently ongoing)"
-        start = dt - abs(self.past)
-        start = to_datetime(start)
         end = to_datetime(dt)
-        return Interval(start, end)
+        start = end - self.past
+        return Interval._from_bounds(start, end)
 
     def rollforward(self, dt):
         "Get next interval (including currently ongoing)"
-        end = dt + abs(self.future)
         start = to_datetime(dt)
-        end = to_datetime(end)
-        return Interval(start, end)
+        end = start + self.future
+        return Interval._from_bounds(start, end)
 
     def __eq__(self, other):
         "Test whether self and other are essentially the same periods"
-        is_same_class = isinstance(self, type(other))
+        is_same_class = type(self) is type(other)
         if is_same_class:
             return (self.past == other.past) and (self.future == other.future)
         return False
 
+    def __hash__(self):
+        # The reference is not part of the equality
+        return hash((self.past, self.future))
+
     def __str__(self):
         if not self.future:
             return f"past {str(self.past)}"
@@ -253,8 +331,36 @@ class TimeDelta(TimePeriod):
     def __repr__(self):
         return f"TimeDelta(past={repr(self.past)}, future={repr(self.future)})"
 
+def _inner_bounds(times):
+    "Get the latest start and the earliest end in one pass"
+    times = iter(times)
+    first = next(times)
+    start = first.left
+    end = first.right
+    for interval in times:
+        if interval.left > start:
+            start = interval.left
+        if interval.right < end:
+            end = interval.right
+    return start, end
+
 def all_overlap(times:List[Interval]):
-    return all(a.overlaps(b) for a, b in itertools.combinations(times, 2))
+    if len(times) == 2:
+        # Most common (a & b)
+        a, b = times
+        return a.overlaps(b)
+    # Intervals overlap pairwise if the latest start
+    # is before the earliest end. If they are equal,
+    # the intervals touching that point decide it by
+    # their closedness.
+    start, end = _inner_bounds(times)
+    if start != end:
+        return start < end
+    touching = [
+        interval for interval in times
+        if interval.left == start or interval.right == end
+    ]
+    return all(a.overlaps(b) for a, b in itertools.combinations(touching, 2))
 
 def get_overlapping(times):
     # Example:
@@ -262,18 +368,52 @@ def get_overlapping(times):
     # B:     <------>
     # C:         <------>
     # Out:       <-->
-    starts = [interval.left for interval in times]
-    ends = [interval.right for interval in times]
-
-    start = max(starts)
-    end = min(ends)
-    return Interval(start, end)
+    if len(times) == 2:
+        # Most common (a & b)
+        a, b = times
+        return a & b
+
+    # The ends are closed only if all the intervals
+    # sharing the end are closed (as with reducing
+    # the intervals with &)
+    times = iter(times)
+    first = next(times)
+    start = first.left
+    end = first.right
+    left_closed = first.closed in ('left', 'both')
+    right_closed = first.closed in ('right', 'both')
+    for interval in times:
+        left = interval.left
+        if left > start:
+            start = left
+            left_closed = interval.closed in ('left', 'both')
+        elif left == start:
+            left_closed = left_closed and interval.closed in ('left', 'both')
+
+        right = interval.right
+        if right < end:
+            end = right
+            right_closed = interval.closed in ('right', 'both')
+        elif right == end:
+            right_closed = right_closed and interval.closed in ('right', 'both')
+    closed = (
+        "both" if left_closed and right_closed
+        else 'left' if left_closed
+        else 'right' if right_closed
+        else 'neither'
+    )
+    return Interval(start, end, closed=closed)
 
 @dataclass(frozen=True)
 class All(TimePeriod):
+    __slots__ = ("periods", "_periods")
 
     periods: FrozenSet[TimePeriod]
 
+    # Maximum tries to find the overlap when rolling
+    # (the periods might never overlap)
+    max_rolls: ClassVar[int] = 1000
+
     def __init__(self, *args):
         if any(not isinstance(arg, TimePeriod) for arg in args):
             raise TypeError("Only TimePeriods supported")
@@ -292,8 +432,17 @@ class All(TimePeriod):
             else:
                 periods.append(arg)
 
-        object.__setattr__(self, "periods", frozenset(periods))
+        periods = frozenset(periods)
+        object.__setattr__(self, "periods", periods)
+        # Iterated when rolling
+        object.__setattr__(self, "_periods", tuple(periods))
 
+    @property
+    def cache_rolls(self) -> bool:
+        # Cached only if all the periods roll the same
+        return all(period.cache_rolls for period in self._periods)
+
+    @cache_roll
     def rollback(self, dt):
 
         # We solve this iteratively
@@ -302,32 +451,34 @@ class All(TimePeriod):
         # 3. If not overlaps, take max and check again
         # 4. If overlaps, get the period that overlaps
 
-        intervals = [
-            period.rollback(dt)
-            for period in self.periods
-        ]
-        all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
-        if all_overlaps:
-            return reduce(lambda a, b: a & b, intervals)
-        # Not found, trying again with next period
-        # Example:
-        # Current:                     |
-        # A:         <-------------->
-        # B:         <---> <--->
-        # C:         <------>
-        # Next try:         |
-        next_dt = min(intervals, key=lambda x: x.right).right
-
-        opened = any(
-            interv.closed not in ('right', 'both')
-            for interv in intervals
-            if interv.right == next_dt
-        )
-        # TODO: If
-        if dt == next_dt:
-            next_dt -= self.resolution
-        return self.rollback(next_dt)
-
+        for _ in range(self.max_rolls):
+            intervals = [
+                period.rollback(dt)
+                for period in self._periods
+            ]
+            if all_overlap(intervals):
+                return get_overlapping(intervals)
+            # Not found, trying again with next period
+            # Example:
+            # Current:                     |
+            # A:         <-------------->
+            # B:         <---> <--->
+            # C:         <------>
+            # Next try:         |
+            next_dt = min(intervals, key=lambda x: x.right).right
+
+            opened = any(
+                interv.closed not in ('right', 'both')
+                for interv in intervals
+                if interv.right == next_dt
+            )
+            # TODO: If
+            if dt == next_dt:
+                next_dt -= RESOLUTION
+            dt = next_dt
+        raise ValueError(f"Periods {self.periods} do not overlap")
+
+    @cache_roll
     def rollforward(self, dt):
         # We solve this iteratively
         # 1. rollforward
@@ -335,34 +486,35 @@ class All(TimePeriod):
         # 3. If not overlaps, take max and check again
         # 4. If overlaps, get the period that overlaps
 
-        intervals = [
-            period.rollforward(dt)
-            for period in self.periods
-        ]
-        all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
-        if all_overlaps:
-            return reduce(lambda a, b: a & b, intervals)
-        # Not found, trying again with next period
-        # Example:
-        # Current: |
-        # A:         <-------------->
-        # B:         <---> <--->
-        # C:                 <------>
-        # Next try:          |
-        next_dt = max(intervals, key=lambda x: x.left).left
-        opened = any(
-            interv.closed not in ('left', 'both')
-            for interv in intervals
-            if interv.left == next_dt
-        )
-        if opened:
-            next_dt -= self.resolution
-        return self.rollforward(next_dt)
+        for _ in range(self.max_rolls):
+            intervals = [
+                period.rollforward(dt)
+                for period in self._periods
+            ]
+            if all_overlap(intervals):
+                return get_overlapping(intervals)
+            # Not found, trying again with next period
+            # Example:
+            # Current: |
+            # A:         <-------------->
+            # B:         <---> <--->
+            # C:                 <------>
+            # Next try:          |
+            next_dt = max(intervals, key=lambda x: x.left).left
+            opened = any(
+                interv.closed not in ('left', 'both')
+                for interv in intervals
+                if interv.left == next_dt
+            )
+            if opened:
+                next_dt -= RESOLUTION
+            dt = next_dt
+        raise ValueError(f"Periods {self.periods} do not overlap")
 
     def __eq__(self, other):
         # self | other
         # bitwise or
-        if isinstance(self, type(other)):
+        if type(self) is type(other):
             return self.periods == other.periods
         return False
 
@@ -375,6 +527,7 @@ class All(TimePeriod):
 
 @dataclass(frozen=True)
 class Any(TimePeriod):
+    __slots__ = ("periods", "_periods")
 
     periods: FrozenSet[TimePeriod]
 
@@ -397,12 +550,15 @@ class Any(TimePeriod):
             else:
                 periods.append(arg)
 
-        object.__setattr__(self, "periods", frozenset(periods))
+        periods = frozenset(periods)
+        object.__setattr__(self, "periods", periods)
+        # Iterated when rolling
+        object.__setattr__(self, "_periods", tuple(periods))
 
     def rollback(self, dt):
         intervals = [
             period.rollback(dt)
-            for period in self.periods
+            for period in self._periods
         ]
 
         # Example:
@@ -431,10 +587,13 @@ class Any(TimePeriod):
         # 2. Check if there is an interval overlapping with longer end
         # 3. Repeat 2 until there is none
 
-        # Sorting the closest first (right is oldest)
-        intervals = sorted(intervals, key=lambda x: x.right, reverse=True)
+        # Sorting the closest first (right is oldest) and
+        # the longest first if as close (not to depend on
+        # the order of the periods)
+        intervals.sort(key=lambda x: (x.right, x.right - x.left), reverse=True)
+        intervals = iter(intervals)
 
-        curr_interval = intervals.pop(0)
+        curr_interval = next(intervals)
         end_interval = curr_interval
 
         for interv in intervals:
@@ -452,7 +611,7 @@ class Any(TimePeriod):
     def rollforward(self, dt):
         intervals = [
             period.rollforward(dt)
-            for period in self.periods
+            for period in self._periods
         ]
 
         # We solve the problem iteratively
@@ -460,10 +619,13 @@ class Any(TimePeriod):
         # 2. Check if there is an interval overlapping with longer end
         # 3. Repeat 2 until there is none
 
-        # Sorting the closest first (left is newest)
-        intervals = sorted(intervals, key=lambda x: x.left, reverse=False)
+        # Sorting the closest first (left is newest) and
+        # the longest first if as close (not to depend on
+        # the order of the periods)
+        intervals.sort(key=lambda x: (x.left, x.left - x.right))
+        intervals = iter(intervals)
 
-        curr_interval = intervals.pop(0)
+        curr_interval = next(intervals)
         start_interval = curr_interval
 
         for interv in intervals:
@@ -481,7 +643,7 @@ class Any(TimePeriod):
     def __eq__(self, other):
         # self | other
         # bitwise or
-        if isinstance(self, type(other)):
+        if type(self) is type(other):
             return self.periods == other.periods
         return False
 
@@ -495,6 +657,7 @@ class Any(TimePeriod):
 @dataclass(frozen=True)
 class StaticInterval(TimePeriod):
     """Interval that is fixed in specific datetimes."""
+    __slots__ = ("start", "end")
 
     start: datetime.datetime
     end: datetime.datetime
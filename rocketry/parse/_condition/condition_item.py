@@ -1,7 +1,7 @@
 from typing import Callable, Dict, Pattern, Union
 from rocketry.core.condition.base import BaseCondition
 from rocketry.session import Session
-from ..utils import ParserError, CondParser
+from ..utils import ParserError, CondParser, get_matcher
 
 
 
@@ -25,20 +25,12 @@ def parse_condition_item(s:str, session=None) -> BaseCondition:
     # TODO: Don't use global
     session = Session.session if session is None else session
 
-    for statement, parser in session.get_cond_parsers().items():
-        if isinstance(statement, Pattern):
-            res = statement.fullmatch(s)
-            if res:
-                args = ()
-                kwargs = res.groupdict()
-                break
-        else:
-            if s == statement:
-                args = (s,)
-                kwargs = {}
-                break
-    else:
+    parsers = session.get_cond_parsers()
+    res = get_matcher(parsers).match(s)
+    if res is None:
         raise ParserError(f"Could not find parser for string {repr(s)}.")
+    statement, kwargs = res
+    parser = parsers[statement]
 
     if isinstance(parser, BaseCondition):
         return parser
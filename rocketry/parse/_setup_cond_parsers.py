@@ -4,7 +4,6 @@ from functools import partial
 from rocketry.conditions.task import TaskFailed, TaskSucceeded, TaskFinished, TaskTerminated, TaskInacted, TaskStarted, TaskRunning, DependSuccess, DependFailure, DependFinish, get_on
 from rocketry.conditions.scheduler import SchedulerStarted, SchedulerCycles
 from rocketry.conditions.time import IsPeriod
-from rocketry.conditions.parameter import ParamExists, IsEnv
 
 from rocketry.time.construct import get_full_cycle, get_between, get_after, get_before
 from rocketry.time import TimeDelta
@@ -17,19 +16,21 @@ from rocketry.conds import (
     cron
 )
 
-def _from_period_task_has(cls, span_type=None, inverse=False, **kwargs):
+_PERIOD_FUNCS = {
+    "between": get_between,
+    "after": get_after,
+    "before": get_before,
+    "starting": get_full_cycle,
+    None: get_full_cycle,
+    "every": TimeDelta,
+    "on": get_on,
+
+    "past": TimeDelta,
+}
 
-    period_func = {
-        "between": get_between,
-        "after": get_after,
-        "before": get_before,
-        "starting": get_full_cycle,
-        None: get_full_cycle,
-        "every": TimeDelta,
-        "on": get_on,
+def _from_period_task_has(cls, span_type=None, inverse=False, **kwargs):
 
-        "past": TimeDelta,
-    }[span_type]
+    period_func = _PERIOD_FUNCS[span_type]
 
     task = kwargs.pop("task", None)
     period = period_func(**kwargs)
@@ -56,33 +57,47 @@ def _set_is_period_parsing():
         }
     )
 
+_TASK_HAS_ACTIONS = {
+    "failed": TaskFailed,
+    "succeeded": TaskSucceeded,
+    "finished": TaskFinished,
+    "terminated": TaskTerminated,
+    "inacted": TaskInacted,
+    "started": TaskStarted,
+}
+
+_TASK_HAS_PATTERNS = (
+    r"{prefix}has {action}",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>starting) (?P<start>.+)",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>between) (?P<start>.+) and (?P<end>.+)",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>after) (?P<start>.+)",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>before) (?P<end>.+)",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute)",
+    r"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>on) (?P<start>.+)",
+    r"{prefix}has {action} (in )?past (?P<past>.+)",
+)
+
+def _from_action(__parser, action, **kwargs):
+    "Parse using the condition class of the action"
+    cls = _TASK_HAS_ACTIONS[action]
+    if __parser is None:
+        return cls(**kwargs)
+    return __parser(cls=cls, **kwargs)
+
 def _set_task_has_parsing():
 
     cond_parsers = Session._cls_cond_parsers
 
-    clss = [
-        ("failed", TaskFailed),
-        ("succeeded", TaskSucceeded),
-        ("finished", TaskFinished),
-        ("terminated", TaskTerminated),
-        ("inacted", TaskInacted),
-        ("started", TaskStarted)
-    ]
-    for (action, cls) in clss:
-        func = partial(_from_period_task_has, cls=cls)
-        for prefix in ("", r"task '(?P<task>.+)' "):
-            cond_parsers.update(
-                {
-                    re.compile(fr"{prefix}has {action}"): cls,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>starting) (?P<start>.+)"): func,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>between) (?P<start>.+) and (?P<end>.+)"): func,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>after) (?P<start>.+)"): func,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>before) (?P<end>.+)"): func,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute)"): func,
-                    re.compile(fr"{prefix}has {action} (?P<type_>this month|this week|today|this hour|this minute) (?P<span_type>on) (?P<start>.+)"): func,
-                    re.compile(fr"{prefix}has {action} (in )?past (?P<past>.+)"): partial(func, span_type='past'),
-                }
-            )
+    # One pattern for all of the actions
+    action = "(?P<action>{})".format("|".join(_TASK_HAS_ACTIONS))
+
+    # Parsers in the same order as _TASK_HAS_PATTERNS
+    func = _from_period_task_has
+    parsers = (None, func, func, func, func, func, func, partial(func, span_type='past'))
+    for prefix in ("", r"task '(?P<task>.+)' "):
+        for pattern, parser in zip(_TASK_HAS_PATTERNS, parsers):
+            regex = re.compile(pattern.format(prefix=prefix, action=action))
+            cond_parsers[regex] = partial(_from_action, parser)
 
 def _set_scheduler_parsing():
 
@@ -164,17 +179,6 @@ def _set_task_pipelining_parsing():
         }
     )
 
-def _set_misc_parsing():
-    cond_parsers = Session._cls_cond_parsers
-
-    cond_parsers.update(
-        {
-            re.compile(r"env '(?P<env>.+)'"): IsEnv,
-            re.compile(r"param '(?P<l>.+)' exists"): ParamExists._from_list,
-            re.compile(r"param '(?P<key>.+)' is '(?P<value>.+)'"): ParamExists._from_key_value,
-        }
-    )
-
 _set_is_period_parsing()
 _set_task_has_parsing()
 _set_scheduler_parsing()
@@ -182,4 +186,3 @@ _set_task_exec_parsing()
 
 _set_task_running_parsing()
 _set_task_pipelining_parsing()
-_set_misc_parsing()
@@ -1,8 +1,6 @@
-
-from typing import Pattern
 from rocketry.core.time.base import TimePeriod
 from rocketry.session import Session
-from ..utils import ParserError
+from ..utils import ParserError, get_matcher
 
 
 def parse_time_item(s:str, session=None):
@@ -11,20 +9,11 @@ def parse_time_item(s:str, session=None):
         # Old way
         session = Session.session
     parsers = session._time_parsers
-    for statement, parser in parsers.items():
-        if isinstance(statement, Pattern):
-            res = statement.fullmatch(s)
-            if res:
-                args = ()
-                kwargs = res.groupdict()
-                break
-        else:
-            if s == statement:
-                args = (s,)
-                kwargs = {}
-                break
-    else:
+    res = get_matcher(parsers).match(s)
+    if res is None:
         raise ParserError(f"Could not find parser for string {repr(s)}.")
+    statement, kwargs = res
+    parser = parsers[statement]
 
     if isinstance(parser, TimePeriod):
         return parser
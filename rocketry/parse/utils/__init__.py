@@ -2,3 +2,4 @@ from .parser import ParserPicker
 from .utils import _get_session
 from .exception import ParserError
 from .cond import CondParser
+from .combine import CombinedPattern, StatementMatcher, get_matcher
@@ -0,0 +1,173 @@
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+# Named groups and their references (not escaped thus
+# after an even number of backslashes)
+_GROUP = re.compile(r"(?<!\\)((?:\\\\)*)\(\?P(<|=)(\w+)([>)])")
+
+# Flags that can be scoped to a branch of an alternation
+_INLINE_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+_DEFAULT_FLAGS = re.compile("").flags
+
+def _get_inline_flags(pattern:Pattern) -> Optional[str]:
+    "Get the flags of a pattern as inline flags (None if not possible)"
+    flags = pattern.flags & ~_DEFAULT_FLAGS
+    inline = ""
+    for flag, letter in _INLINE_FLAGS.items():
+        if flags & flag:
+            inline += letter
+            flags &= ~flag
+    return inline if not flags else None
+
+class CombinedPattern:
+    """Combine several patterns to one alternation
+
+    Each pattern is followed by its own empty named
+    group and its named groups are prefixed so that
+    the branches don't collide. The branch that matched
+    is found from the name of the last group (the
+    marker) thus only one regex match is needed
+    regardless of the number of patterns.
+
+    Examples:
+    ---------
+        combined = CombinedPattern([re.compile(r"a (?P<x>.+)"), re.compile(r"b (?P<x>.+)")])
+        combined.fullmatch("b foo")
+        >>> (1, {'x': 'foo'})
+    """
+
+    def __init__(self, patterns:Iterable[Union[str, Pattern]]):
+        branches = []
+        self._branches: Dict[str, int] = {}
+        self._aliases: List[Tuple[str, ...]] = []
+        self._names: List[Tuple[str, ...]] = []
+        for i, pattern in enumerate(patterns):
+            if isinstance(pattern, re.Pattern):
+                flags = _get_inline_flags(pattern)
+                pattern = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+            marker = f"_{i}"
+            groups = {}
+
+            def rename(res, prefix=marker, groups=groups):
+                escapes, kind, name, end = res.groups()
+                alias = f"{prefix}_{name}"
+                groups[alias] = name
+                return f"{escapes}(?P{kind}{alias}{end}"
+
+            pattern = _GROUP.sub(rename, pattern)
+            # The marker group is last so that it is also the
+            # last group matched and the branch still starts
+            # with its literal (which the regex engine checks fast)
+            branches.append(f"(?:{pattern})(?P<{marker}>)")
+            self._branches[marker] = i
+            self._aliases.append(tuple(groups))
+            self._names.append(tuple(groups.values()))
+        self.regex = re.compile("|".join(branches))
+
+    def fullmatch(self, s:str) -> Optional[Tuple[int, dict]]:
+        "Match the string and get the index of the pattern and its groups"
+        res = self.regex.fullmatch(s)
+        if res is None:
+            return None
+        i = self._branches[res.lastgroup]
+        # Getting the groups at once (0 to always get a tuple)
+        values = res.group(0, *self._aliases[i])[1:]
+        return i, dict(zip(self._names[i], values))
+
+
+# Patterns that cannot be put to an alternation as is:
+# numbered backreferences would point to wrong groups
+# and global inline flags must be at the start
+_NUMBERED_REF = re.compile(r"\\[1-9]|\(\?\([0-9]")
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+def _is_combinable(statement) -> bool:
+    if isinstance(statement, str):
+        return True
+    return (
+        isinstance(statement, re.Pattern)
+        and isinstance(statement.pattern, str)
+        and _get_inline_flags(statement) is not None
+        and not _NUMBERED_REF.search(statement.pattern)
+        and not _GLOBAL_FLAGS.search(statement.pattern)
+    )
+
+class StatementMatcher:
+    """Find the first statement of a parser table
+    that matches a string
+
+    Consecutive statements are combined to one
+    pattern thus a string is matched with one
+    regex match instead of one per statement. Strings
+    must match exactly and patterns must fully match
+    (as in the parser tables).
+    """
+
+    def __init__(self, parsers:dict):
+        self.parsers = parsers
+        self.version = getattr(parsers, "version", None)
+        self.statements = list(parsers)
+        self.segments: List[Tuple[Union[CombinedPattern, Pattern], list]] = []
+
+        combinable = []
+        for statement in self.statements:
+            if _is_combinable(statement):
+                combinable.append(statement)
+                continue
+            self._add_combined(combinable)
+            combinable = []
+            self.segments.append((statement, [statement]))
+        self._add_combined(combinable)
+
+    def _add_combined(self, statements:list):
+        if statements:
+            patterns = (
+                re.escape(statement) if isinstance(statement, str) else statement
+                for statement in statements
+            )
+            try:
+                combined = CombinedPattern(patterns)
+            except re.error:
+                # Some syntax could not be combined (ie. the renamed
+                # groups are referred), matching one by one instead
+                self.segments.extend((statement, [statement]) for statement in statements)
+            else:
+                self.segments.append((combined, statements))
+
+    def is_current(self, parsers:dict) -> bool:
+        "Whether the parser table has not changed since creation"
+        if parsers is not self.parsers:
+            return False
+        if self.version is not None:
+            # Versioned table (as in the session)
+            return parsers.version == self.version
+        return list(parsers) == self.statements
+
+    def match(self, s:str) -> Optional[Tuple[Union[str, Pattern], dict]]:
+        "Get the first matching statement and its groups"
+        for matcher, statements in self.segments:
+            if isinstance(matcher, CombinedPattern):
+                res = matcher.fullmatch(s)
+                if res is not None:
+                    i, kwargs = res
+                    return statements[i], kwargs
+            elif isinstance(matcher, re.Pattern):
+                res = matcher.fullmatch(s)
+                if res:
+                    return matcher, res.groupdict()
+            elif s == matcher:
+                return matcher, {}
+        return None
+
+_MATCHERS: Dict[int, StatementMatcher] = {}
+MAX_MATCHERS = 32
+
+def get_matcher(parsers:dict) -> StatementMatcher:
+    "Get the (cached) matcher of a parser table"
+    matcher = _MATCHERS.get(id(parsers))
+    if matcher is None or not matcher.is_current(parsers):
+        if len(_MATCHERS) >= MAX_MATCHERS:
+            # Matchers keep the tables alive
+            _MATCHERS.clear()
+        matcher = _MATCHERS[id(parsers)] = StatementMatcher(parsers)
+    return matcher
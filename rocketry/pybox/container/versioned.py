@@ -0,0 +1,60 @@
+class VersionedDict(dict):
+
+    """A dict that counts its modifications
+
+    The version changes whenever the dict is modified
+    thus whether a dict has changed can be checked
+    without comparing its contents.
+
+    Example:
+    --------
+        d = VersionedDict(a=1)
+        version = d.version
+        d["b"] = 2
+        d.version == version
+        >>> False
+    """
+
+    # Also the default when unpickling
+    version = 0
+
+    def _modified(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._modified()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._modified()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._modified()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._modified()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._modified()
+
+    def copy(self):
+        return type(self)(self)
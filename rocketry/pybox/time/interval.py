@@ -21,6 +21,15 @@ class Interval:
         if self.closed not in ('left', 'right', 'both', 'neither'):
             raise ValueError(f"Invalid close: {self.closed}")
 
+    @classmethod
+    def _from_bounds(cls, left, right, closed="left"):
+        "Create interval skipping validation (left is known to be before right)"
+        self = object.__new__(cls)
+        attrs = self.__dict__
+        attrs["left"] = left
+        attrs["right"] = right
+        attrs["closed"] = closed
+        return self
 
     def __contains__(self, dt):
         if self.closed == "right":
@@ -15,6 +15,7 @@ from itertools import chain
 from typing import TYPE_CHECKING, Callable, ClassVar, Iterable, Dict, List, Optional, Set, Tuple, Type, Union
 from pydantic.v1 import BaseModel, root_validator, validator
 from rocketry.pybox.time import to_timedelta
+from rocketry.pybox.container.versioned import VersionedDict
 from rocketry.log.defaults import create_default_handler
 from rocketry._base import RedBase
 from rocketry.tasks.run_id import uuid
@@ -57,6 +58,7 @@ class Config(BaseModel):
     silence_task_prerun: bool = False # Whether to silence errors occurred in setting a task to run
     silence_task_logging: bool = False # Whether to silence errors occurred in logging a task
     silence_cond_check: bool = False # Whether to silence errors occurred in checking conditions
+    reorder_conditions: bool = False # Whether to observe cheap and decisive subconditions of All/Any first
     cycle_sleep: Optional[float] = 0.1
     debug: bool = False
 
@@ -176,8 +178,10 @@ class Session(RedBase):
     parameters: 'Parameters'
     _scheduler: 'Scheduler'
 
-    _time_parsers: ClassVar[Dict] = {}
-    _cls_cond_parsers: ClassVar[Dict] = {} # Default condition parsers
+    # Versioned so that the matchers of the parsers
+    # know when to update
+    _time_parsers: ClassVar[Dict] = VersionedDict()
+    _cls_cond_parsers: ClassVar[Dict] = VersionedDict() # Default condition parsers
 
     def _get_parameters(self, value):
         from rocketry.core import Parameters
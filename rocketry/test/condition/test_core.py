@@ -1,9 +1,13 @@
+import itertools
+import pickle
+import traceback
+import time
 
 import pytest
 
 from rocketry.conditions import (
     ParamExists, IsPeriod,
-    Any, All, Not
+    Any, All, Not, BaseCondition
 )
 from rocketry.conds import true, false
 from rocketry.time import TimeDelta, always
@@ -89,14 +93,14 @@ def test_fail(get_cond,exc):
 @pytest.mark.parametrize("obj,string,represent",
     [
         pytest.param(
-            All(true, false),
-            "(true & false)",
-            "All(true, false)",
+            All(IsPeriod(always), Not(IsPeriod(always))),
+            "(currently always & ~currently always)",
+            "All(currently always, ~currently always)",
             id="All"),
         pytest.param(
-            Any(true, false),
-            "(true | false)",
-            "Any(true, false)",
+            Any(IsPeriod(always), Not(IsPeriod(always))),
+            "(currently always | ~currently always)",
+            "Any(currently always, ~currently always)",
             id="Any"),
         pytest.param(
             IsPeriod(always),
@@ -104,10 +108,25 @@ def test_fail(get_cond,exc):
             "IsPeriod(period=always)",
             id="IsPeriod"),
         pytest.param(
-            Not(true),
-            "~true",
-            "Not(true)",
+            Not(IsPeriod(always)),
+            "~currently always",
+            "Not(IsPeriod(period=always))",
             id="Not"),
+        pytest.param(
+            All(true, false),
+            "(false)",
+            "All(false)",
+            id="All (simplified)"),
+        pytest.param(
+            Any(true, false),
+            "(true)",
+            "Any(true)",
+            id="Any (simplified)"),
+        pytest.param(
+            Not(true),
+            "false",
+            "false",
+            id="Not (simplified)"),
     ]
 )
 def test_representation(obj, string, represent):
@@ -115,11 +134,12 @@ def test_representation(obj, string, represent):
     assert repr(obj) == represent
 
 def test_logic():
-    assert list(All(true, true, false)) == [true, true, false]
-    assert list(Any(true, true, false)) == [true, true, false]
+    a, b, c = ParamExists("a"), ParamExists("b"), ParamExists("c")
+    assert list(All(a, b, c)) == [a, b, c]
+    assert list(Any(a, b, c)) == [a, b, c]
 
-    assert All(true, true, false)[2] is false
-    assert Any(true, true, false)[2] is false
+    assert All(a, b, c)[2] is c
+    assert Any(a, b, c)[2] is c
 
     assert Not(true) == false
     assert Not(true) != true
@@ -128,3 +148,274 @@ def test_logic():
     assert Not(false) != false
 
     assert Not(false) != "invalid"
+
+def test_hash():
+    a, b = ParamExists("a"), ParamExists("b")
+
+    assert hash(ParamExists("a")) == hash(a)
+    assert hash(All(a, b)) == hash(All(a, b))
+    assert hash(Not(a)) == hash(Not(a))
+
+    assert {All(a, b), All(a, b), Any(a, b), Not(a), Not(a)} == {All(a, b), Any(a, b), Not(a)}
+    assert len({a, b, ParamExists("a")}) == 2
+
+def test_slots():
+    class Slotted(BaseCondition):
+        __slots__ = ("value",)
+
+        def __init__(self, value):
+            self.value = value
+
+        def get_state(self):
+            return self.value
+
+    assert Slotted(True) == Slotted(True)
+    assert Slotted(True) != Slotted(False)
+    assert All(Slotted(True), Slotted(False)).observe() is False
+
+def test_pickle():
+    a, b = ParamExists("a"), ParamExists("b")
+    a._str = "param 'a' exists"
+    cond = All(Any(a, b), Not(b))
+    assert not hasattr(cond, "__dict__")
+
+    unpickled = pickle.loads(pickle.dumps(cond))
+    assert unpickled == cond
+    assert str(unpickled[0][0]) == "param 'a' exists"
+
+def test_flatten():
+    a, b, c, d = ParamExists("a"), ParamExists("b"), ParamExists("c"), ParamExists("d")
+
+    class MyAll(All):
+        pass
+
+    class MyAny(Any):
+        pass
+
+    # Subclasses don't flatten their base types thus these are nested
+    assert All(MyAll(All(a, b), c), d).subconditions == (a, b, c, d)
+    assert Any(a, MyAny(Any(b, MyAny(c)), d)).subconditions == (a, b, c, d)
+
+    # Different types are not flattened
+    assert All(Any(a, b), c).subconditions == (Any(a, b), c)
+
+def test_simplify():
+    a, b = ParamExists("a"), ParamExists("b")
+
+    assert All(true, a, true, b).subconditions == (a, b)
+    assert All(a, false, b).subconditions == (false,)
+    assert All(true, true).subconditions == (true,)
+
+    assert Any(false, a, false, b).subconditions == (a, b)
+    assert Any(a, true, b).subconditions == (true,)
+    assert Any(false, false).subconditions == (false,)
+
+    assert Not(true) is not true and Not(true) == false
+    assert Not(false) == true
+    assert Not(Not(a)) is a
+    assert Not(Not(Not(a))) == Not(a)
+
+    # Duplicates
+    assert All(a, b, a).subconditions == (a, b)
+    assert Any(a, ParamExists("a")).subconditions == (a,)
+
+    # Negations of the siblings
+    c = ParamExists("c")
+    assert Any(a, All(Not(a), b)).subconditions == (a, b)
+    assert All(a, Any(b, Not(a), c)).subconditions == (a, Any(b, c))
+    assert Any(All(Not(a), Any(b, c)), a).subconditions == (b, c, a)
+    assert Any(a, All(Not(a))).subconditions == (true,)
+    assert All(Any(Not(a)), a).subconditions == (false,)
+
+    # Negations of the containers of constants
+    assert Not(All(a, false)) == true
+    assert Not(Any(true, a)) == false
+
+class _Constant(BaseCondition):
+    def __init__(self, value, delay=0, name=None):
+        self.value = value
+        self.delay = delay
+        self.name = name
+
+    def get_state(self):
+        time.sleep(self.delay)
+        return self.value
+
+@pytest.mark.parametrize("cls,decisive", [pytest.param(All, False, id="All"), pytest.param(Any, True, id="Any")])
+def test_reorder(session, cls, decisive):
+    slow = _Constant(decisive, delay=0.001, name="slow")
+    indecisive = _Constant(not decisive, name="indecisive")
+    fast = _Constant(decisive, name="fast")
+
+    def get_observes(*conds):
+        return tuple(cond.observe for cond in conds)
+
+    cond = cls(slow, indecisive, fast)
+    for _ in range(cond.n_reorder_observations):
+        assert cond.observe() is decisive
+    # Not reordering by default
+    assert cond._observe_fns == get_observes(slow, indecisive, fast)
+
+    session.config.reorder_conditions = True
+    cond = cls(slow, indecisive, fast)
+    for _ in range(cond.n_reorder_observations - 1):
+        assert cond.observe() is decisive
+    assert cond._observe_fns == get_observes(slow, indecisive, fast)
+
+    assert cond.observe() is decisive
+    # The order is kept for never observed
+    assert cond._observe_fns == get_observes(slow, indecisive, fast)
+
+    cond = cls(indecisive, fast, slow)
+    hash_orig = hash(cond)
+    conds = {cond}
+    for _ in range(cond.n_reorder_observations):
+        assert cond.observe() is decisive
+    assert cond._observe_fns == get_observes(fast, indecisive, slow)
+
+    # The condition itself is not changed
+    assert cond.subconditions == (indecisive, fast, slow)
+    assert hash(cond) == hash_orig
+    assert cond in conds
+    assert cond == cls(indecisive, fast, slow)
+
+def test_observe_specialized(session):
+    from rocketry.args import Config, Session
+
+    class NoArgs(BaseCondition):
+        def get_state(self):
+            return True
+
+    class WithArgs(NoArgs):
+        def get_state(self, session=Session()):
+            return session.parameters.get("x") == 1
+
+    class Overridden(WithArgs):
+        def observe(self, **kwargs):
+            return "overridden"
+
+    assert NoArgs().observe(task="ignored") is True
+    assert WithArgs().observe(session=session) is False
+    session.parameters["x"] = 1
+    assert WithArgs().observe(session=session) is True
+    assert Overridden().observe() == "overridden"
+
+    class WithConfig(NoArgs):
+        # Config takes the session from its own signature
+        def get_state(self, config=Config(), session=Session()):
+            return config is session.config
+
+    assert WithConfig().observe(session=session) is True
+
+def test_memoize_cycle():
+    from rocketry.core.condition import memoize_cycle
+
+    class Counter(BaseCondition):
+        __pure__ = True
+        def __init__(self):
+            self.n = 0
+
+        def get_state(self):
+            self.n += 1
+            return True
+
+    class Impure(Counter):
+        __pure__ = False
+
+    cond = Counter()
+    impure = Impure()
+    with memoize_cycle():
+        for _ in range(3):
+            assert cond.observe() is True
+            assert cond.observe(task="a") is True
+            assert impure.observe() is True
+    assert cond.n == 2
+    assert impure.n == 3
+
+    assert cond.observe() is True
+    assert cond.n == 3
+
+def test_memoize_cycle_temporary():
+    from rocketry.core.condition import memoize_cycle
+
+    class Pure(BaseCondition):
+        __pure__ = True
+        def __init__(self, value):
+            self.value = value
+
+        def get_state(self):
+            return self.value
+
+    with memoize_cycle():
+        # The conditions are freed after observing thus
+        # the next one may be created to the same address
+        for i in range(10):
+            value = i % 2 == 0
+            assert Pure(value).observe() is value
+
+@pytest.mark.parametrize("get_cond", [
+    pytest.param(lambda a, b, c: All(Any(a, b), Not(c)), id="All(Any, Not)"),
+    pytest.param(lambda a, b, c: Any(All(a, Not(b)), c), id="Any(All, c)"),
+    pytest.param(lambda a, b, c: All(Not(Any(a, b)), Any(b, All(c, a))), id="nested"),
+    pytest.param(lambda a, b, c: Any(MyAll(a, b), Not(c)), id="subclass"),
+    pytest.param(lambda a, b, c: MyAll(Any(a, b), Not(c)), id="subclass root"),
+])
+def test_compile(get_cond):
+    from rocketry.core.condition.base import _compile_observe
+    for values in itertools.product([True, False], repeat=3):
+        a, b, c = (_Constant(value, name=name) for value, name in zip(values, "abc"))
+        cond = get_cond(a, b, c)
+        assert cond._compiled is not None
+        expected = cond.observe()
+
+        observe = _compile_observe(cond, cond.subconditions)
+        assert observe() is expected
+        assert observe(session=None) is expected
+        # Compiled again after unpickling
+        unpickled = pickle.loads(pickle.dumps(cond))
+        assert unpickled._compiled is not None
+        assert unpickled.observe() is expected
+
+def test_compile_traceback():
+    class Failing(BaseCondition):
+        def get_state(self):
+            raise RuntimeError("Oops")
+
+    cond = All(Any(_Constant(False), Failing()), Not(_Constant(False)))
+    with pytest.raises(RuntimeError) as exc:
+        cond._compiled()
+    frame = traceback.extract_tb(exc.value.__traceback__)[1]
+    assert frame.filename.startswith("<rocketry condition")
+    assert frame.line == "return bool(((_observe0() or _observe1()) and (not _observe2())))"
+
+def test_compile_reorder(session):
+    session.config.reorder_conditions = True
+    calls = []
+    class Slow(BaseCondition):
+        def get_state(self):
+            calls.append("slow")
+            time.sleep(0.001)
+            return True
+    class Fast(BaseCondition):
+        def get_state(self):
+            calls.append("fast")
+            return True
+
+    cond = All(Slow(), Not(Fast()))
+    for _ in range(cond.n_reorder_observations):
+        cond.observe()
+    calls.clear()
+    assert cond.observe() is False
+    assert calls == ["fast"]
+
+def test_compile_deep():
+    from rocketry.core.condition.base import _compile_observe
+    cond = _Constant(True)
+    for _ in range(150):
+        cond = All(Any(cond, _Constant(False)), _Constant(True))
+    assert _compile_observe(cond, cond.subconditions) is None
+    assert cond._compiled is None
+    assert cond.observe() is True
+
+class MyAll(All):
+    pass
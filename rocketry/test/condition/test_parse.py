@@ -1,5 +1,6 @@
 
 import itertools
+import re
 
 import pytest
 from rocketry.conditions.task.task import TaskRunnable
@@ -8,6 +9,8 @@ from rocketry.parse.utils import ParserError
 from rocketry.conditions.scheduler import SchedulerCycles, SchedulerStarted
 from rocketry.parse.condition import parse_condition
 from rocketry.conditions import ParamExists
+from rocketry.core import BaseCondition
+from rocketry.session import Session
 from rocketry.conditions import (
     AlwaysTrue, AlwaysFalse,
     All, Any, Not,
@@ -224,3 +227,33 @@ def test_task_to_str(cond_str, task):
 def test_failure(cond_str, exc):
     with pytest.raises(exc):
         parse_condition(cond_str)
+
+def test_class_parsers(session):
+    class IsFoo(BaseCondition):
+        __parsers__ = {
+            re.compile(r"is foo '(?P<outcome>.+)'"): "__init__",
+            "is foo": "_from_default",
+        }
+
+        def __init__(self, outcome):
+            self.outcome = outcome
+
+        @classmethod
+        def _from_default(cls):
+            return cls("bar")
+
+        def get_state(self):
+            return self.outcome == "bar"
+
+    class IsSubFoo(IsFoo):
+        pass
+
+    try:
+        assert parse_condition("is foo 'bar'") == IsFoo("bar")
+        assert parse_condition("is foo") == IsFoo("bar")
+
+        # Subclasses don't register the parsers of the parent
+        assert [parser for parser in session._cond_parsers.values() if parser in (IsFoo, IsSubFoo)] == [IsFoo]
+    finally:
+        for statement in IsFoo.__parsers__:
+            Session._cls_cond_parsers.pop(statement)
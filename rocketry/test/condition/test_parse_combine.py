@@ -0,0 +1,101 @@
+import re
+
+import pytest
+
+from rocketry.parse.utils import CombinedPattern, StatementMatcher, get_matcher
+from rocketry.pybox.container.versioned import VersionedDict
+
+@pytest.mark.parametrize("s,expected",
+    [
+        pytest.param("a foo", (0, {"x": "foo"}), id="first"),
+        pytest.param("b foo bar", (1, {"x": "foo", "y": "bar"}), id="second"),
+        pytest.param("b foo", (2, {"x": "foo"}), id="fallback"),
+        pytest.param("c", (3, {}), id="no groups"),
+        pytest.param("d", None, id="no match"),
+    ]
+)
+def test_fullmatch(s, expected):
+    combined = CombinedPattern([
+        re.compile(r"a (?P<x>.+)"),
+        re.compile(r"b (?P<x>[a-z]+) (?P<y>.+)"),
+        r"b (?P<x>.+)",
+        "c",
+    ])
+    assert combined.fullmatch(s) == expected
+
+def test_matcher_order():
+    parsers = {
+        re.compile(r"x (?P<a>.+)"): "first",
+        "x y": "second",
+        re.compile(r"X (?P<b>.+)", flags=re.IGNORECASE): "third",
+        re.compile(r"(?P<c>.+) \1"): "fourth",
+        re.compile(r"z (?P<a>.+)"): "fifth",
+        re.compile(r"(?i)w (?P<a>.+)"): "sixth",
+        re.compile(r"v (?P<a>.+)", flags=re.ASCII): "seventh",
+    }
+    matcher = StatementMatcher(parsers)
+    # Flags that can be inline are combined
+    assert len(matcher.segments) == 5
+
+    for s, parser, kwargs in [
+        ("x y", "first", {"a": "y"}),
+        ("X y", "third", {"b": "y"}),
+        ("q q", "fourth", {"c": "q"}),
+        ("z y", "fifth", {"a": "y"}),
+        ("W y", "sixth", {"a": "y"}),
+        ("v y", "seventh", {"a": "y"}),
+    ]:
+        statement, groups = matcher.match(s)
+        assert parsers[statement] == parser
+        assert groups == kwargs
+    assert matcher.match("q") is None
+
+def test_matcher_cache():
+    parsers = {re.compile(r"x (?P<a>.+)"): "first"}
+    matcher = get_matcher(parsers)
+    assert get_matcher(parsers) is matcher
+
+    parsers["y"] = "second"
+    assert not matcher.is_current(parsers)
+    matcher = get_matcher(parsers)
+    statement, groups = matcher.match("y")
+    assert parsers[statement] == "second"
+
+def test_matcher_cache_versioned():
+    parsers = VersionedDict({re.compile(r"x (?P<a>.+)"): "first"})
+    matcher = get_matcher(parsers)
+    assert get_matcher(parsers) is matcher
+
+    parsers.update({"y": "second"})
+    assert not matcher.is_current(parsers)
+    matcher = get_matcher(parsers)
+    assert matcher.is_current(parsers)
+    statement, groups = matcher.match("y")
+    assert parsers[statement] == "second"
+
+    parsers.pop("y")
+    assert not matcher.is_current(parsers)
+    assert get_matcher(parsers).match("y") is None
+
+def test_matcher_escaped():
+    parsers = {
+        re.compile(r"a\\(?P<x>.+)"): "first",
+        re.compile(r"b\(?P<x>.+\)"): "second",
+    }
+    matcher = StatementMatcher(parsers)
+    assert len(matcher.segments) == 1
+    assert matcher.match("a\\foo") == (re.compile(r"a\\(?P<x>.+)"), {"x": "foo"})
+    assert matcher.match("b(P<x>foo)") == (re.compile(r"b\(?P<x>.+\)"), {})
+
+def test_matcher_not_combinable():
+    # The conditional refers to a group that is renamed
+    # when combining thus matched one by one
+    parsers = {
+        re.compile(r"a(?P<x>b)?(?(x)c|d)"): "first",
+        "e": "second",
+    }
+    matcher = StatementMatcher(parsers)
+    assert len(matcher.segments) == 2
+    assert matcher.match("abc") == (re.compile(r"a(?P<x>b)?(?(x)c|d)"), {"x": "b"})
+    assert matcher.match("ad") == (re.compile(r"a(?P<x>b)?(?(x)c|d)"), {"x": None})
+    assert matcher.match("e") == ("e", {})
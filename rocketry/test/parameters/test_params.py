@@ -73,3 +73,17 @@ def test_equal():
     assert Parameters({"a": 0, "b": 1}) == Parameters({"a": 0, "b": 1})
     assert Parameters({"a": 0, "b": 1}) != 1
     assert Parameters({"a": 0, "b": 1}) != 1
+
+def test_from_signature():
+    class MyClass:
+        def method(self, x, y=Private("secret"), z=5):
+            ...
+
+    first, second = MyClass(), MyClass()
+    params = Parameters._from_signature(first.method)
+    assert params == Parameters(y=Private("secret"))
+
+    # The signature is cached by the function but the
+    # parameters are separate
+    params["w"] = 1
+    assert Parameters._from_signature(second.method) == Parameters(y=Private("secret"))
@@ -75,3 +75,10 @@ def test_empty():
 def test_repr():
     for closed in ("left", "right", "neither"):
         assert repr(Interval(datetime(2022, 1, 1), datetime(2022, 1, 1), closed=closed))
+
+def test_from_bounds():
+    start, end = to_datetime("2022-07-01"), to_datetime("2022-07-12")
+    interval = Interval._from_bounds(start, end)
+    assert interval == Interval(start, end)
+    assert hash(interval) == hash(Interval(start, end))
+    assert Interval._from_bounds(start, end, closed="both") == Interval(start, end, closed="both")
@@ -5,7 +5,8 @@ import pytest
 from rocketry.core.time.base import (
     All, Any
 )
-from rocketry.time.interval import TimeOfDay
+from rocketry.time.interval import TimeOfDay, TimeOfHour
+from rocketry.time.delta import TimeDelta
 
 from_iso = datetime.datetime.fromisoformat
 
@@ -84,6 +85,13 @@ def test_all_not_in(dt, periods):
                 TimeOfDay("14:00", "16:00"),
             ],
             id="Combination (right edge)"),
+        pytest.param(
+            from_iso("2022-01-01 12:30:00"),
+            [
+                TimeOfHour("15:00", "45:00"),
+                TimeDelta("2 hours"),
+            ],
+            id="Start of interval and delta"),
     ],
 )
 def test_any_in(dt, periods):
@@ -115,3 +123,13 @@ def test_any_in(dt, periods):
 def test_any_not_in(dt, periods):
     time = Any(*periods)
     assert dt not in time
+
+def test_any_period_order():
+    dt = from_iso("2022-01-01 12:30:00")
+    time = Any(TimeOfHour("15:00", "45:00"), TimeDelta("2 hours"))
+    rolls = (time.rollback(dt), time.rollforward(dt))
+
+    # The result does not depend on the order of the periods
+    object.__setattr__(time, "_periods", time._periods[::-1])
+    object.__setattr__(time, "_rolls", None)
+    assert (time.rollback(dt), time.rollforward(dt)) == rolls
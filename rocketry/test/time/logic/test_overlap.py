@@ -0,0 +1,31 @@
+import itertools
+from functools import reduce
+
+import pytest
+
+from rocketry.core.time.base import all_overlap, get_overlapping
+from rocketry.pybox.time import Interval
+
+CLOSED = ('left', 'right', 'both', 'neither')
+ENDPOINTS = [(0, 2), (2, 4), (1, 3), (2, 2), (4, 6)]
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_all_overlap(n):
+    intervals = [
+        Interval(left, right, closed=closed)
+        for (left, right), closed in itertools.product(ENDPOINTS, CLOSED)
+    ]
+    for times in itertools.combinations(intervals, n):
+        expected = all(a.overlaps(b) for a, b in itertools.combinations(times, 2))
+        assert all_overlap(list(times)) == expected, times
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_get_overlapping(n):
+    intervals = [
+        Interval(left, right, closed=closed)
+        for (left, right), closed in itertools.product(ENDPOINTS, CLOSED)
+    ]
+    for times in itertools.combinations(intervals, n):
+        if all_overlap(list(times)):
+            expected = reduce(lambda a, b: a & b, times)
+            assert get_overlapping(times) == expected, times
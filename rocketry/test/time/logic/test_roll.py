@@ -5,7 +5,7 @@ import pytest
 from rocketry.core.time.base import (
     All, Any
 )
-from rocketry.time.interval import TimeOfDay, TimeOfMinute
+from rocketry.time.interval import TimeOfDay, TimeOfMinute, TimeOfYear
 
 from_iso = datetime.datetime.fromisoformat
 
@@ -92,6 +92,17 @@ def test_rollback_all(dt, periods, roll_start, roll_end):
     assert roll_start == interval.left
     assert roll_end == interval.right
 
+@pytest.mark.parametrize("periods", [
+    pytest.param((TimeOfDay("10:00", "11:00"), TimeOfDay("12:00", "13:00")), id="TimeOfDay"),
+    pytest.param((TimeOfYear("Nov", "Jan"), TimeOfYear("Feb", "Mar")), id="TimeOfYear"),
+])
+def test_roll_all_not_overlapping(periods):
+    time = All(*periods)
+    with pytest.raises(ValueError):
+        time.rollforward(from_iso("2022-01-01 09:00:00"))
+    with pytest.raises(ValueError):
+        time.rollback(from_iso("2022-01-01 09:00:00"))
+
 @pytest.mark.parametrize(
     "dt,periods,roll_start,roll_end",
     [
@@ -1,10 +1,15 @@
+import datetime
+import pickle
+
 import pytest
 
 from rocketry.time.interval import (
     TimeOfHour,
     TimeOfDay,
+    TimeOfWeek,
 )
-from rocketry.time import All, Any, always
+from rocketry.time import All, Any, TimeDelta, TimeInterval, always
+from rocketry.pybox.time import Interval
 
 def test_equal():
     assert TimeOfHour("10:00") != TimeOfHour("11:00")
@@ -12,6 +17,11 @@ def test_equal():
     assert (TimeOfHour("10:00", "12:00") & TimeOfHour("11:00", "13:00")) == (TimeOfHour("10:00", "12:00") & TimeOfHour("11:00", "13:00"))
     assert (TimeOfHour("10:00", "12:00") | TimeOfHour("11:00", "13:00")) == (TimeOfHour("10:00", "12:00") | TimeOfHour("11:00", "13:00"))
 
+def test_hash():
+    assert hash(TimeDelta("1 hour")) == hash(TimeDelta("1 hour", reference=datetime.datetime(2022, 1, 1)))
+    assert len({TimeOfHour("10:00"), TimeOfHour("10:00"), TimeDelta("1 hour"), TimeDelta("1 hour")}) == 2
+    assert TimeOfHour("10:00") != TimeOfDay("00:10")
+
 def test_and():
     time = TimeOfHour("10:00", "14:00") & TimeOfHour("09:00", "12:00")
     assert time == All(TimeOfHour("10:00", "14:00"), TimeOfHour("09:00", "12:00"))
@@ -59,3 +69,58 @@ def test_str():
 def test_repr():
     assert repr(TimeOfDay("10:00", "12:00") & TimeOfDay("16:00", "17:00")) == 'All(TimeOfDay(_start=36000000000, _end=43200000000), TimeOfDay(_start=57600000000, _end=61200000000))'
     assert repr(TimeOfDay("10:00", "12:00") | TimeOfDay("16:00", "17:00")) == 'Any(TimeOfDay(_start=36000000000, _end=43200000000), TimeOfDay(_start=57600000000, _end=61200000000))'
+
+def test_roll_cached():
+    time = TimeOfDay("10:00", "14:00")
+    dt = datetime.datetime(2022, 1, 1, 12, 00)
+    interval = time.rollforward(dt)
+    assert time.rollforward(dt) is interval
+    assert time.rollback(dt) == Interval(datetime.datetime(2022, 1, 1, 10, 00), dt)
+
+    # Changing the period clears the cache
+    time.set_start("11:00")
+    assert time.rollforward(dt) is not interval
+    assert time.rollback(dt).left == datetime.datetime(2022, 1, 1, 11, 00)
+
+def test_roll_not_cached():
+    rolls = []
+    class MyInterval(TimeInterval):
+        # Rolls depend on other than the datetime
+        __hash__ = object.__hash__
+        def rollforward(self, dt):
+            rolls.append(dt)
+            return super().rollforward(dt)
+        def rollstart(self, dt):
+            return dt
+        def next_end(self, dt):
+            return dt + datetime.timedelta(hours=len(rolls))
+
+    time = MyInterval()
+    dt = datetime.datetime(2022, 1, 1, 12, 00)
+    assert time.rollforward(dt) != time.rollforward(dt)
+
+    # Not cached if any of the periods is not
+    time = time & TimeOfDay("10:00", "14:00")
+    assert not time.cache_rolls
+    time.rollforward(dt)
+    assert getattr(time, "_rolls", None) is None
+
+@pytest.mark.parametrize("time", [
+    pytest.param(TimeOfDay("10:00", "14:00"), id="TimeOfDay"),
+    pytest.param(TimeOfDay("10:00", "14:00") & TimeOfWeek("Mon"), id="All"),
+    pytest.param(TimeOfDay("10:00", "14:00") | TimeOfWeek("Mon"), id="Any"),
+    pytest.param(TimeDelta("1 hour"), id="TimeDelta"),
+    pytest.param(always, id="StaticInterval"),
+])
+def test_pickle(time):
+    assert not hasattr(time, "__dict__")
+    time.rollback(datetime.datetime(2022, 1, 1, 12, 00))
+    unpickled = pickle.loads(pickle.dumps(time))
+    assert unpickled == time
+    assert unpickled.rollback(datetime.datetime(2022, 1, 1, 12, 00)) == time.rollback(datetime.datetime(2022, 1, 1, 12, 00))
+
+def test_namespace():
+    from rocketry import time
+    from rocketry.time import interval
+    for name in ("TimeInterval", "AnchoredInterval", "Interval", "datetime_to_dict", "to_microseconds"):
+        assert getattr(time, name) is getattr(interval, name)
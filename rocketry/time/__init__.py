@@ -1,8 +1,15 @@
+import re
+
 from rocketry.core.time import always, never
 from rocketry.session import Session
-from rocketry.core.time import TimeDelta, StaticInterval, All, Any
+from rocketry.core.time import TimeDelta, TimeInterval, StaticInterval, All, Any
+from rocketry.core.time.anchor import AnchoredInterval
+from rocketry.pybox.time import Interval, datetime_to_dict, to_microseconds
 
-from .interval import *
+from .interval import (
+    TimeOfSecond, TimeOfMinute, TimeOfHour, TimeOfDay,
+    TimeOfWeek, TimeOfMonth, TimeOfYear, RelativeDay
+)
 from .construct import get_between, get_before, get_after, get_full_cycle, get_on
 from .delta import TimeSpanDelta
 from .cron import Cron
@@ -1,18 +1,21 @@
-from typing import Callable
+from typing import Callable, ClassVar
 from dataclasses import dataclass
 
-from rocketry.core.time.base import TimePeriod, always
+from rocketry.core.time.base import TimePeriod, always, cache_roll
 
 from .interval import TimeOfHour, TimeOfDay, TimeOfMinute, TimeOfWeek, TimeOfMonth, TimeOfYear
 
 @dataclass(frozen=True)
 class Cron(TimePeriod):
+    __slots__ = ("minute", "hour", "day_of_month", "month", "day_of_week")
 
-    minute: str = "*"
-    hour: str = "*"
-    day_of_month: str = "*"
-    month: str = "*"
-    day_of_week: str = "*"
+    minute: str
+    hour: str
+    day_of_month: str
+    month: str
+    day_of_week: str
+
+    cache_rolls: ClassVar[bool] = True
 
     def __init__(self, minute="*", hour="*", day_of_month="*", month="*", day_of_week="*"):
         object.__setattr__(self, "minute", minute)
@@ -26,10 +29,12 @@ class Cron(TimePeriod):
         # -: range of values
         # /: step values
 
+    @cache_roll
     def rollforward(self, dt):
         "Get previous time interval of the period."
         return self.get_subperiod().rollforward(dt)
 
+    @cache_roll
     def rollback(self, dt):
         "Get previous time interval of the period."
         return self.get_subperiod().rollback(dt)
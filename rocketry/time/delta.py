@@ -1,6 +1,6 @@
 import time
 import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Callable, Union
 
 from rocketry.core.time import TimeDelta
@@ -8,10 +8,11 @@ from rocketry.pybox.time import to_timedelta, Interval
 
 @dataclass(frozen=True, init=False)
 class TimeSpanDelta(TimeDelta):
+    __slots__ = ("near", "far")
 
     near: int
     far: int
-    reference: Union[datetime.datetime, Callable] = field(default=None)
+    reference: Union[datetime.datetime, Callable]
 
     def __init__(self, near=None, far=None, reference=None, **kwargs):
 
@@ -48,11 +49,15 @@ class TimeSpanDelta(TimeDelta):
 
     def __eq__(self, other):
         "Test whether self and other are essentially the same periods"
-        is_same_class = isinstance(self, type(other))
+        is_same_class = type(self) is type(other)
         if is_same_class:
             return (self.near == other.near) and (self.far == other.far)
         return False
 
+    def __hash__(self):
+        # The reference is not part of the equality
+        return hash((self.near, self.far))
+
     def __str__(self):
         return repr(self)
 
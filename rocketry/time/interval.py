@@ -6,7 +6,7 @@ from typing import ClassVar, List
 
 import dateutil
 
-from rocketry.core.time.anchor import AnchoredInterval
+from rocketry.core.time.anchor import AnchoredInterval, _day_microseconds
 from rocketry.core.time.base import TimeInterval
 from rocketry.pybox.time import datetime_to_dict, to_microseconds
 from rocketry.pybox.time.interval import Interval
@@ -19,6 +19,7 @@ class TimeOfSecond(AnchoredInterval):
     max: 999999 microsecond
 
     """
+    __slots__ = ()
 
     _scope: ClassVar[str] = "second"
 
@@ -46,6 +47,7 @@ class TimeOfMinute(AnchoredInterval):
     min: 0 seconds, 0 microsecond
     max: 59 seconds, 999999 microsecond
     """
+    __slots__ = ()
 
     _scope: ClassVar[str] = "minute"
 
@@ -82,6 +84,7 @@ class TimeOfHour(AnchoredInterval):
         # From 15 past to half past
         TimeOfHour("15:00", "30:00")
     """
+    __slots__ = ()
     _scope: ClassVar[str] = "hour"
     _scope_max: ClassVar[int] = to_microseconds(hour=1)
     _unit_resolution: ClassVar[int] = to_microseconds(minute=1)
@@ -119,6 +122,7 @@ class TimeOfDay(AnchoredInterval):
         # From 10 o'clock to 15 o'clock
         TimeOfDay("10:00", "15:00")
     """
+    __slots__ = ()
     _scope: ClassVar[str] = "day"
     _scope_max: ClassVar[int] = to_microseconds(day=1)
     _unit_resolution: ClassVar[int] = to_microseconds(hour=1)
@@ -138,13 +142,7 @@ class TimeOfDay(AnchoredInterval):
 
     def anchor_dt(self, dt, **kwargs):
         "Turn datetime to microseconds according to the scope (by removing higher time elements)"
-        d = datetime_to_dict(dt)
-        d = {
-            key: val
-            for key, val in d.items()
-            if key in ("hour", "minute", "second", "microsecond")
-        }
-        return to_microseconds(**d)
+        return _day_microseconds(dt)
 
 @dataclass(frozen=True, init=False)
 class TimeOfWeek(AnchoredInterval):
@@ -157,6 +155,7 @@ class TimeOfWeek(AnchoredInterval):
         # From Monday 3 PM to Wednesday 4 PM
         TimeOfWeek("Mon 15:00", "Wed 16:00")
     """
+    __slots__ = ()
     _scope: ClassVar[str] = "week"
     _scope_max: ClassVar[int] = to_microseconds(day=7) # Sun day end of day
     _unit_resolution: ClassVar[int] = to_microseconds(day=1)
@@ -206,14 +205,8 @@ class TimeOfWeek(AnchoredInterval):
 
     def anchor_dt(self, dt, **kwargs):
         "Turn datetime to microseconds according to the scope (by removing higher time elements)"
-        d = datetime_to_dict(dt)
-        d = {
-            key: val
-            for key, val in d.items()
-            if key in ("hour", "minute", "second", "microsecond")
-        }
         dayofweek = dt.weekday()
-        return to_microseconds(**d) + dayofweek * to_microseconds(day=1)
+        return _day_microseconds(dt) + dayofweek * to_microseconds(day=1)
 
 
 @dataclass(frozen=True, init=False)
@@ -227,6 +220,7 @@ class TimeOfMonth(AnchoredInterval):
         # From 10 o'clock to 15 o'clock
         TimeOfMonth("1st", "5th")
     """
+    __slots__ = ()
     # TODO: Support for month end (ie. last 5th day of month to last 2nd)
     # Could be implemented by allowing minus _start and minus _end
     #   rollforward/rollback/contains would need slight changes
@@ -274,17 +268,8 @@ class TimeOfMonth(AnchoredInterval):
 
     def anchor_dt(self, dt, **kwargs):
         "Turn datetime to microseconds according to the scope (by removing higher time elements)"
-        d = datetime_to_dict(dt)
-        d = {
-            key: val
-            for key, val in d.items()
-            if key in ("day", "hour", "minute", "second", "microsecond")
-        }
-        if "day" in d:
-            # Day (of month) does not start from 0 (but from 1)
-            d["day"] = d["day"] - 1
-
-        return to_microseconds(**d)
+        # Day (of month) does not start from 0 (but from 1)
+        return _day_microseconds(dt) + (dt.day - 1) * to_microseconds(day=1)
 
     def get_scope_forward(self, dt):
         n_days = calendar.monthrange(dt.year, dt.month)[1]
@@ -307,6 +292,7 @@ class TimeOfYear(AnchoredInterval):
         # From 10 o'clock to 15 o'clock
         TimeOfYear("Jan", "Feb")
     """
+    __slots__ = ()
 
     # We take the longest year there is and translate all years to that
     # using first the month and then the day of month
@@ -389,17 +375,10 @@ class TimeOfYear(AnchoredInterval):
 
     def anchor_dt(self, dt, **kwargs):
         "Turn datetime to microseconds according to the scope (by removing higher time elements)"
-        dt_dict = datetime_to_dict(dt)
-        d = {
-            key: val
-            for key, val in dt_dict.items()
-            if key in ("day", "hour", "minute", "second", "microsecond")
-        }
-        nth_month = dt_dict["month"] - 1
-        if "day" in d:
-            # Day (of month) does not start from 0 (but from 1)
-            d["day"] = d["day"] - 1
-        return self._month_start_mapping[nth_month] + to_microseconds(**d)
+        nth_month = dt.month - 1
+        # Day (of month) does not start from 0 (but from 1)
+        day_microseconds = _day_microseconds(dt) + (dt.day - 1) * to_microseconds(day=1)
+        return self._month_start_mapping[nth_month] + day_microseconds
 
 
 @dataclass(frozen=True, init=False)
@@ -412,6 +391,7 @@ class RelativeDay(TimeInterval):
         Day("yesterday")
         Day("yesterday")
     """
+    __slots__ = ("day", "start_time", "end_time")
 
     offsets: ClassVar = {
         "today": datetime.timedelta(),